@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from .validation import parse, read_header
+
+
+def read_dataset_csv(dataset):
+    """Stored CSV parsed like an upload: known columns only, declared dtypes,
+    cells that aren't numbers as NaN."""
+    # go through the storage so compressed blobs are decompressed in a stream,
+    # each pass reopens the blob since zstd streams can't seek back
+    storage, name = dataset.file.storage, dataset.file.name
+    with storage.open(name, 'rb') as f:
+        header = read_header(f)
+    df, _, _ = parse(lambda: storage.open(name, 'rb'), header)
+    return df
+
+
+def read_names(dataset, rows):
+    """Equipment Name of the given rows of the stored CSV, None without that column."""
+    storage, name = dataset.file.storage, dataset.file.name
+    with storage.open(name, 'rb') as f:
+        header = read_header(f)
+    column = next((c for c in header if c.strip() == 'Equipment Name'), None)
+    if column is None:
+        return None
+    with storage.open(name, 'rb') as f:
+        names = pd.read_csv(f, usecols=[column], dtype=object)[column].to_numpy()
+    return names[rows]
+
+
+def compute_stats(df):
+    # convert numpy types to python types for django
+    total_records = int(len(df))
+
+    avg_pressure = 0.0
+    if 'Pressure' in df.columns:
+        avg_pressure = float(df['Pressure'].mean())
+        if np.isnan(avg_pressure): avg_pressure = 0.0
+
+    avg_temp = 0.0
+    if 'Temperature' in df.columns:
+        avg_temp = float(df['Temperature'].mean())
+        if np.isnan(avg_temp): avg_temp = 0.0
+
+    type_dist = {}
+    if 'Type' in df.columns:
+        vc = df['Type'].value_counts()
+        for k, v in vc.items():
+            type_dist[str(k)] = int(v)
+
+    return {
+        'total_records': total_records,
+        'avg_pressure': round(avg_pressure, 2),
+        'avg_temp': round(avg_temp, 2),
+        'type_distribution': type_dist
+    }
+
+
+def widen_floats(df):
+    # float32 columns would display as 5.199999809..., go through their
+    # shortest repr instead. Meant for the few rows that get shown.
+    for name in df.columns[(df.dtypes == np.float32).to_numpy()]:
+        df = df.assign(**{name: df[name].astype(str).astype('float64')})
+    return df
+
+
+def preview_rows(df, flag_critical=False, limit=50):
+    df = widen_floats(df.head(limit))
+    if flag_critical:
+        df = df.assign(is_critical=(df['Pressure'] > 8.0) | (df['Temperature'] > 100))
+    # clean up nan values before sending to frontend
+    df_clean = df.astype(object).where(pd.notnull(df), None)
+    return df_clean.to_dict(orient='records')
@@ -0,0 +1,216 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .validation import NUMERIC_COLUMNS
+
+FEATURES = NUMERIC_COLUMNS
+
+# scales MAD / mean absolute deviation to a standard deviation for normal data
+MAD_SCALE = 1.4826
+MEAN_AD_SCALE = 1.2533
+
+# robust z above this counts as an outlier, also used to pick covariance inliers
+Z_THRESHOLD = 3.5
+# below this many inliers per type the features are treated as uncorrelated
+MIN_COVARIANCE_ROWS = 10
+
+# the summary stored on the Dataset keeps this many rows, deeper requests are
+# served from the full per-row ranking, saved the first time one comes in
+TOP_K = 100
+TOP_K_PER_TYPE = 20
+MAX_K = 10000
+UNKNOWN_TYPE = '(unknown)'
+# bump when the saved ranking layout changes
+RANKING_VERSION = 1
+
+
+def _center_scale(block):
+    """Per-column median and robust scale of an (n, features) block."""
+    # nanmedian is a lot slower than median, only pay for it with missing values
+    median_fn = np.nanmedian if np.isnan(block).any() else np.median
+    with warnings.catch_warnings():
+        # a column with no readings in this type is all NaN, its median and
+        # scale are NaN and every z-score in it is missing
+        warnings.simplefilter('ignore', RuntimeWarning)
+        median = median_fn(block, axis=0)
+        dev = np.abs(block - median)
+        scale = MAD_SCALE * median_fn(dev, axis=0)
+
+        # more than half the values identical gives MAD 0, fall back to mean abs deviation
+        flat = ~(scale > 0)
+        if flat.any():
+            scale[flat] = MEAN_AD_SCALE * np.nanmean(dev[:, flat], axis=0)
+    # constant column: nothing is an outlier
+    scale[~(scale > 0)] = np.inf
+    return median, scale
+
+
+def _mahalanobis(z):
+    """Distance of each row of robust z-scores, using the correlation between
+    features estimated on inliers."""
+    inliers = z[(np.abs(z) < Z_THRESHOLD).all(axis=1)]
+    if len(inliers) < MIN_COVARIANCE_ROWS:
+        return np.sqrt((z * z).sum(axis=1))
+    precision = np.linalg.pinv(np.cov(inliers, rowvar=False))
+    d2 = ((z @ precision) * z).sum(axis=1)
+    return np.sqrt(np.maximum(d2, 0.0))
+
+
+def score(df):
+    """Robust per-Type z-scores and a multivariate outlier score for every row.
+
+    Returns (types, codes, groups, medians, scales, z, scores): groups holds the
+    row indices of each type, z is (rows, features) with NaN for missing values,
+    scores is the Mahalanobis distance of the z-scores within the row's Type.
+    """
+    values = np.column_stack([
+        pd.to_numeric(df[c], errors='coerce').to_numpy(dtype=np.float64) for c in FEATURES
+    ])
+
+    if 'Type' in df.columns and isinstance(df['Type'].dtype, pd.CategoricalDtype):
+        # validated uploads already carry integer codes
+        codes = df['Type'].cat.codes.to_numpy()
+        types = [str(t) for t in df['Type'].cat.categories]
+    elif 'Type' in df.columns:
+        codes, types = pd.factorize(df['Type'], sort=True)
+        types = [str(t) for t in types]
+    else:
+        codes, types = np.full(len(df), -1, dtype=np.int64), []
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(types), codes)
+        types.append(UNKNOWN_TYPE)
+
+    # one sort puts every type in a contiguous block, work on the sorted copy
+    # and scatter back once at the end
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(types) + 1))
+    values = values[order]
+
+    z_sorted = np.empty_like(values)
+    scores_sorted = np.empty(len(values))
+    medians, scales = [], []
+    for g in range(len(types)):
+        lo, hi = bounds[g], bounds[g + 1]
+        if lo == hi:
+            # category without rows
+            medians.append(np.full(len(FEATURES), np.nan))
+            scales.append(np.full(len(FEATURES), np.nan))
+            continue
+        block = values[lo:hi]
+        median, scale = _center_scale(block)
+        gz = (block - median) / scale
+        z_sorted[lo:hi] = gz
+        scores_sorted[lo:hi] = _mahalanobis(np.nan_to_num(gz, nan=0.0))
+        medians.append(median)
+        scales.append(scale)
+
+    z = np.empty_like(z_sorted)
+    z[order] = z_sorted
+    scores = np.empty_like(scores_sorted)
+    scores[order] = scores_sorted
+    groups = [order[bounds[g]:bounds[g + 1]] for g in range(len(types))]
+    return types, codes, groups, medians, scales, z, scores
+
+
+def _top(indices, scores, k):
+    if len(indices) > k:
+        indices = indices[np.argpartition(-scores[indices], k - 1)[:k]]
+    return indices[np.argsort(-scores[indices], kind='stable')]
+
+
+def _round_or_none(x, digits=4):
+    return round(float(x), digits) if np.isfinite(x) else None
+
+
+def _records(ranking, rows, names=None):
+    # names line up with rows, they aren't kept in the saved ranking
+    types, codes = ranking['types'], ranking['codes']
+    z, scores = ranking['z'], ranking['scores']
+    return [{
+        'row': int(i) + 1,
+        'name': None if names is None else str(names[n]),
+        'type': str(types[codes[i]]),
+        'score': _round_or_none(scores[i]),
+        'z': {c: _round_or_none(z[i, j]) for j, c in enumerate(FEATURES)},
+    } for n, i in enumerate(rows)]
+
+
+def summarize(df, k=TOP_K, k_per_type=TOP_K_PER_TYPE):
+    """Score every row. Returns (summary, ranking): the JSON-ready summary
+    persisted on the Dataset (per-type baselines and the top-scoring rows
+    overall and per type) and the per-row arrays behind it."""
+    types, codes, groups, medians, scales, z, scores = score(df)
+    # records are built from these arrays both here and for deeper requests
+    # later, so both agree to the last digit
+    ranking = {
+        'types': np.array(types, dtype=str),
+        'codes': codes.astype(np.int32),
+        'z': z.astype(np.float32),
+        'scores': scores.astype(np.float32),
+    }
+    scores = ranking['scores']
+    names = df['Equipment Name'].to_numpy() if 'Equipment Name' in df.columns else None
+
+    def top(rows, k):
+        rows = _top(rows, scores, k)
+        return _records(ranking, rows, None if names is None else names[rows])
+
+    by_type = {}
+    for g, t in enumerate(types):
+        rows = groups[g]
+        if not len(rows):
+            continue
+        by_type[t] = {
+            'count': int(len(rows)),
+            'outliers': int((scores[rows] > Z_THRESHOLD).sum()),
+            'median': {c: _round_or_none(medians[g][j]) for j, c in enumerate(FEATURES)},
+            'scale': {c: _round_or_none(scales[g][j]) for j, c in enumerate(FEATURES)},
+            'top': top(rows, k_per_type),
+        }
+
+    summary = {
+        'features': FEATURES,
+        'threshold': Z_THRESHOLD,
+        'outliers': int((scores > Z_THRESHOLD).sum()),
+        'top': top(np.arange(len(scores)), k),
+        'by_type': by_type,
+    }
+    return summary, ranking
+
+
+def ranking_path(dataset):
+    from . import arrays
+    return arrays.cache_path(dataset, 'ranking', RANKING_VERSION)
+
+
+def save_ranking(dataset, ranking):
+    from . import arrays
+    arrays.save(ranking_path(dataset), ranking)
+
+
+def load_ranking(dataset):
+    """Per-row scores of a dataset, rescored from the stored CSV and saved
+    the first time they are needed."""
+    from . import arrays
+
+    ranking = arrays.load(ranking_path(dataset))
+    if ranking is None:
+        from .analysis import read_dataset_csv
+        _, ranking = summarize(read_dataset_csv(dataset))
+        save_ranking(dataset, ranking)
+    return ranking
+
+
+def top_records(dataset, k, equipment_type=None):
+    """The k highest-scoring rows of a dataset, optionally of one equipment type."""
+    from .analysis import read_names
+
+    ranking = load_ranking(dataset)
+    rows = np.arange(len(ranking['scores']))
+    if equipment_type is not None:
+        code = list(ranking['types']).index(equipment_type)
+        rows = rows[ranking['codes'] == code]
+    rows = _top(rows, ranking['scores'], k)
+    return _records(ranking, rows, read_names(dataset, rows))
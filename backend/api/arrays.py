@@ -0,0 +1,34 @@
+import glob
+import os
+
+import numpy as np
+from django.conf import settings
+
+from .storage import atomic_write
+
+
+def cache_path(dataset, kind, version):
+    stamp = int(dataset.uploaded_at.timestamp())
+    return os.path.join(settings.DATASET_CACHE_DIR, f"dataset_{dataset.id}_{stamp}_{kind}_v{version}.npz")
+
+
+def load(path):
+    """Arrays saved at `path` as a dict, or None when nothing is cached there."""
+    try:
+        with np.load(path) as data:
+            return dict(data)
+    except FileNotFoundError:
+        return None
+
+
+def save(path, arrays):
+    atomic_write(path, lambda f: np.savez_compressed(f, **arrays))
+
+
+def delete(dataset):
+    """Remove every cached array of a dataset, returns the bytes freed."""
+    freed = 0
+    for path in glob.glob(os.path.join(settings.DATASET_CACHE_DIR, f"dataset_{dataset.id}_*.npz")):
+        freed += os.path.getsize(path)
+        os.remove(path)
+    return freed
@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+# numeric columns we precompute chart data for
+from .validation import NUMERIC_COLUMNS
+
+HISTOGRAM_BINS = 20
+DENSITY_BINS = 16
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+# upper bound for ?points=, the lttb loop runs once per point
+MAX_POINTS = 10000
+# bump when the stored series layout changes
+SERIES_VERSION = 1
+
+
+def _finite(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values[np.isfinite(values)]
+
+
+def _edges(values, bins):
+    # shared bin edges so per-type histograms line up with the overall one
+    values = _finite(values)
+    if values.size == 0:
+        return None
+    lo, hi = float(values.min()), float(values.max())
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, bins + 1)
+
+
+def histogram(values, edges):
+    if edges is None:
+        return {'edges': [], 'counts': []}
+    counts, _ = np.histogram(_finite(values), bins=edges)
+    return {'edges': [round(float(e), 4) for e in edges], 'counts': counts.tolist()}
+
+
+def density_grid(x, y, x_edges, y_edges):
+    if x_edges is None or y_edges is None:
+        return {'x_edges': [], 'y_edges': [], 'counts': []}
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    mask = np.isfinite(x) & np.isfinite(y)
+    counts, _, _ = np.histogram2d(x[mask], y[mask], bins=[x_edges, y_edges])
+    return {
+        'x_edges': [round(float(e), 4) for e in x_edges],
+        'y_edges': [round(float(e), 4) for e in y_edges],
+        'counts': counts.astype(np.int64).tolist(),
+    }
+
+
+def build_chart_data(df):
+    """Binned histograms and a Pressure vs Temperature density grid,
+    overall and per equipment Type."""
+    columns = [c for c in NUMERIC_COLUMNS if c in df.columns]
+    edges = {c: _edges(df[c].to_numpy(), HISTOGRAM_BINS) for c in columns}
+
+    groups = {}
+    if 'Type' in df.columns:
+        groups = {str(k): g for k, g in df.groupby('Type', observed=True, sort=True)}
+
+    histograms = {
+        'all': {c: histogram(df[c].to_numpy(), edges[c]) for c in columns},
+        'by_type': {
+            t: {c: histogram(g[c].to_numpy(), edges[c]) for c in columns}
+            for t, g in groups.items()
+        },
+    }
+
+    density = {}
+    if 'Pressure' in df.columns and 'Temperature' in df.columns:
+        x_edges = _edges(df['Pressure'].to_numpy(), DENSITY_BINS)
+        y_edges = _edges(df['Temperature'].to_numpy(), DENSITY_BINS)
+        density = {
+            'x': 'Pressure',
+            'y': 'Temperature',
+            'all': density_grid(df['Pressure'].to_numpy(), df['Temperature'].to_numpy(), x_edges, y_edges),
+            'by_type': {
+                t: density_grid(g['Pressure'].to_numpy(), g['Temperature'].to_numpy(), x_edges, y_edges)
+                for t, g in groups.items()
+            },
+        }
+
+    return {'histograms': histograms, 'density': density}
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets, returns indices of the kept points."""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # bucket boundaries for everything between the first and last point
+    bounds = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = bounds[i], bounds[i + 1]
+        # average of the next bucket (or the last point)
+        if i + 2 < len(bounds):
+            nxt = slice(bounds[i + 1], bounds[i + 2])
+            avg_x, avg_y = x[nxt].mean(), y[nxt].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x) * (by - y[a]) - (x[a] - bx) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def min_max(y, n_buckets):
+    """Keep the min and max of each bucket, returns sorted indices."""
+    n = len(y)
+    if n_buckets * 2 >= n or n_buckets < 1:
+        return np.arange(n)
+
+    size = n // n_buckets
+    usable = size * n_buckets
+    blocks = y[:usable].reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    idx = np.concatenate([offsets + blocks.argmin(axis=1), offsets + blocks.argmax(axis=1)])
+    if usable < n:
+        tail = y[usable:]
+        idx = np.concatenate([idx, [usable + int(tail.argmin()), usable + int(tail.argmax())]])
+    return np.unique(idx)
+
+
+def series_base(df):
+    """Per-column (x, y) arrays that series requests are downsampled from.
+
+    Keeps the min and max of MAX_POINTS buckets, so any request up to
+    MAX_POINTS points is served without touching the CSV again.
+    """
+    base = {}
+    for column in NUMERIC_COLUMNS:
+        if column not in df.columns:
+            continue
+        y = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64)
+        x = np.arange(len(y), dtype=np.int64)
+        mask = np.isfinite(y)
+        x, y = x[mask], y[mask]
+        idx = min_max(y, MAX_POINTS)
+        base[f'{column}_x'] = x[idx]
+        base[f'{column}_y'] = y[idx].astype(np.float32)
+        base[f'{column}_total'] = np.int64(len(y))
+    return base
+
+
+def load_series(dataset, df=None):
+    """Stored series base of a dataset, built from `df` (or the stored CSV)
+    and saved when it is missing."""
+    from . import arrays
+
+    path = arrays.cache_path(dataset, 'series', SERIES_VERSION)
+    base = arrays.load(path)
+    if base is None:
+        if df is None:
+            from .analysis import read_dataset_csv
+            df = read_dataset_csv(dataset)
+        base = series_base(df)
+        arrays.save(path, base)
+    return base
+
+
+def downsample(base, column, points, method='lttb'):
+    """Downsample a column of a series base (indexed by row number) to about `points` points."""
+    x = base[f'{column}_x']
+    y = base[f'{column}_y'].astype(np.float64)
+
+    if method == 'minmax':
+        idx = min_max(y, max(points // 2, 1))
+    else:
+        idx = lttb(x.astype(np.float64), y, points)
+
+    return {
+        'column': column,
+        'method': method,
+        'total_points': int(base[f'{column}_total']),
+        'x': x[idx].tolist(),
+        'y': [round(float(v), 4) for v in y[idx]],
+    }
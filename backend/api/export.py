@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+
+from .storage import atomic_write
+
+# bump when the report layout changes so cached PDFs get re-rendered
+REPORT_VERSION = 1
+
+
+def select_datasets(start=None, end=None, ids=None):
+    """Datasets uploaded between two dates (inclusive) and/or with the given ids."""
+    from .models import Dataset
+
+    datasets = Dataset.objects.order_by('uploaded_at')
+    if start:
+        datasets = datasets.filter(uploaded_at__date__gte=start)
+    if end:
+        datasets = datasets.filter(uploaded_at__date__lte=end)
+    if ids:
+        datasets = datasets.filter(pk__in=ids)
+    return datasets
+
+
+def report_cache_path(dataset):
+    stamp = int(dataset.uploaded_at.timestamp())
+    return os.path.join(settings.REPORT_CACHE_DIR, f"dataset_{dataset.id}_{stamp}_v{REPORT_VERSION}.pdf")
+
+
+def report_filename(dataset):
+    return f"report_{dataset.id}_{dataset.uploaded_at:%Y%m%d}.pdf"
+
+
+def render_report(dataset_id, refresh=False):
+    """Path of the cached PDF report for a dataset, rendering it first if needed."""
+    from .models import Dataset
+
+    dataset = Dataset.objects.get(pk=dataset_id)
+    path = report_cache_path(dataset)
+    if not refresh and os.path.exists(path):
+        return path
+
+    from . import analysis, reports
+    buffer = reports.build_report_pdf(dataset, analysis.read_dataset_csv(dataset))
+    atomic_write(path, lambda f: f.write(buffer.getvalue()))
+    return path
+
+
+def _init_worker():
+    # spawned workers start from a clean interpreter, forking a process that
+    # holds open db connections isn't safe
+    import django
+    django.setup()
+
+    from .warmup import prewarm
+    prewarm()
+
+
+def iter_reports(datasets, workers=None, refresh=False):
+    """Yield (dataset, path, error) as each report becomes available.
+
+    Cached reports come first, the rest are rendered across a process pool and
+    yielded in completion order.
+    """
+    pending = []
+    for dataset in datasets:
+        path = report_cache_path(dataset)
+        if not refresh and os.path.exists(path):
+            yield dataset, path, None
+        else:
+            pending.append(dataset)
+
+    if not pending:
+        return
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    if workers <= 1:
+        for dataset in pending:
+            try:
+                yield dataset, render_report(dataset.id, refresh), None
+            except Exception as e:
+                yield dataset, None, str(e)
+        return
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+    )
+    try:
+        futures = {pool.submit(render_report, dataset.id, refresh): dataset for dataset in pending}
+        for future in as_completed(futures):
+            dataset = futures[future]
+            try:
+                yield dataset, future.result(), None
+            except Exception as e:
+                yield dataset, None, str(e)
+    finally:
+        # also runs when a streaming client disconnects early
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _ChunkSink:
+    # write-only, unseekable target for ZipFile, drained after each entry
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_zip(results):
+    """Zip archive bytes for `iter_reports` results, one chunk per finished report."""
+    sink = _ChunkSink()
+    errors = []
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for dataset, path, error in results:
+            if error:
+                errors.append(f"dataset {dataset.id}: {error}")
+                continue
+            zf.write(path, report_filename(dataset))
+            yield sink.drain()
+        if errors:
+            zf.writestr('errors.txt', '\n'.join(errors) + '\n')
+    yield sink.drain()
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api import arrays
+from api.models import Dataset
+
+
+class Command(BaseCommand):
+    help = ("Compress old uploaded CSVs and move old datasets to the cold tier, dropping their "
+            "cached arrays. Stats stay in the database.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--compress-after-days', type=int, default=settings.CSV_COMPRESS_AFTER_DAYS,
+                            help="compress plain CSVs older than this")
+        parser.add_argument('--cold-after-days', type=int, default=settings.CSV_COLD_AFTER_DAYS,
+                            help="move datasets older than this to the cold tier")
+        parser.add_argument('--dry-run', action='store_true', help="only report what would change")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        compress_before = now - timedelta(days=options['compress_after_days'])
+        cold_before = now - timedelta(days=options['cold_after_days'])
+        dry_run = options['dry_run']
+
+        compressed = moved = missing = cleared = 0
+        saved = 0
+
+        # either threshold may be the earlier one, visit everything past the later
+        datasets = Dataset.objects.filter(
+            uploaded_at__lt=max(compress_before, cold_before)).order_by('uploaded_at')
+        for dataset in datasets.iterator():
+            storage = dataset.file.storage
+            name = dataset.file.name
+            if not name or not storage.exists(name):
+                missing += 1
+                continue
+
+            before = storage.size(name)
+            to_cold = dataset.tier != Dataset.TIER_COLD and dataset.uploaded_at < cold_before
+
+            if to_cold:
+                if not dry_run:
+                    new_name = storage.recompress(
+                        name,
+                        level=settings.CSV_COLD_COMPRESSION_LEVEL,
+                        new_name=f"csvs/cold/{name.rsplit('/', 1)[-1]}",
+                    )
+                    dataset.file.name = new_name
+                    dataset.tier = Dataset.TIER_COLD
+                    dataset.save(update_fields=['file', 'tier'])
+                    saved += before - storage.size(new_name)
+                moved += 1
+                self.stdout.write(f"cold: dataset {dataset.id} ({name})")
+            elif dataset.uploaded_at < compress_before and storage.stored_codec(name) is None:
+                if not dry_run:
+                    new_name = storage.recompress(name)
+                    if new_name != name:
+                        dataset.file.name = new_name
+                        dataset.save(update_fields=['file'])
+                    saved += before - storage.size(new_name)
+                compressed += 1
+                self.stdout.write(f"compressed: dataset {dataset.id} ({name})")
+
+            # cold datasets drop their cached arrays, they are rebuilt if needed
+            if dataset.tier == Dataset.TIER_COLD and not dry_run:
+                freed = arrays.delete(dataset)
+                if freed:
+                    cleared += 1
+                    saved += freed
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{compressed} compressed, {moved} moved to cold tier, {cleared} caches cleared, {missing} missing files, "
+            f"{saved / 1024:.1f} KiB saved" + (" (dry run)" if dry_run else "")
+        ))
@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+DESKTOP_DIR = os.path.join(os.path.dirname(settings.BASE_DIR), 'desktop-frontend')
+
+# each probe runs in a fresh interpreter and prints its elapsed seconds
+IMPORT_PROBE = """
+import time, importlib
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(time.perf_counter() - start)
+"""
+
+DJANGO_IMPORT_PROBE = """
+import os, time, importlib
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+import django
+django.setup()
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(time.perf_counter() - start)
+"""
+
+FIRST_REQUEST_PROBE = """
+import os, time
+start = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+import django
+django.setup()
+from django.test import Client
+Client().{method}({path!r}, {data})
+print(time.perf_counter() - start)
+"""
+
+LOGIN_DIALOG_PROBE = """
+import os, sys, time
+start = time.perf_counter()
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, {desktop_dir!r})
+import main
+app = main.QApplication(sys.argv)
+dialog = main.LoginDialog()
+dialog.show()
+app.processEvents()
+print(time.perf_counter() - start)
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure import times, time to first request and time to the desktop login dialog."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help="runs per probe, the median is reported")
+        parser.add_argument('--output', help="append the results as a JSON line to this file")
+
+    def handle(self, *args, **options):
+        workdir = tempfile.mkdtemp(prefix='bench-startup-')
+        env = dict(os.environ)
+        env.update({
+            'SQLITE_PATH': os.path.join(workdir, 'db.sqlite3'),
+            'MEDIA_ROOT': os.path.join(workdir, 'media'),
+        })
+        env.pop('POSTGRES_DB', None)
+        self.env = env
+        self.repeat = options['repeat']
+
+        results = {}
+        try:
+            subprocess.run([sys.executable, 'manage.py', 'migrate', '-v', '0'],
+                           cwd=settings.BASE_DIR, env=env, check=True)
+
+            for module in ['api.views', 'api.analysis', 'api.validation', 'api.anomaly', 'api.charts', 'api.reports']:
+                results[f'import {module}'] = self._probe(DJANGO_IMPORT_PROBE.format(module=module))
+
+            results['first request GET /api/history/'] = self._probe(
+                FIRST_REQUEST_PROBE.format(method='get', path='/api/history/', data='None'))
+            results['first request POST /api/login/'] = self._probe(
+                FIRST_REQUEST_PROBE.format(method='post', path='/api/login/', data="{'username': 'x', 'password': 'x'}"))
+            results['manage.py check'] = self._time_command([sys.executable, 'manage.py', 'check'])
+
+            if os.path.isdir(DESKTOP_DIR):
+                results['desktop login dialog'] = self._probe(
+                    LOGIN_DIALOG_PROBE.format(desktop_dir=DESKTOP_DIR), cwd=DESKTOP_DIR)
+                results['desktop import matplotlib qt5agg'] = self._probe(
+                    IMPORT_PROBE.format(module='matplotlib.backends.backend_qt5agg'))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        for name, seconds in results.items():
+            value = 'n/a' if seconds is None else f"{1000 * seconds:8.1f} ms"
+            self.stdout.write(f"{name:<40} {value}")
+
+        if options['output']:
+            record = {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'repeat': self.repeat,
+                'results_ms': {k: None if v is None else round(1000 * v, 1) for k, v in results.items()},
+            }
+            with open(options['output'], 'a') as f:
+                f.write(json.dumps(record) + '\n')
+
+    def _probe(self, code, cwd=None):
+        samples = []
+        for _ in range(self.repeat):
+            proc = subprocess.run([sys.executable, '-c', code], cwd=cwd or settings.BASE_DIR,
+                                  env=self.env, capture_output=True, text=True)
+            if proc.returncode != 0:
+                # missing optional deps (e.g. PyQt5 on a server) just skip the probe
+                return None
+            samples.append(float(proc.stdout.strip().splitlines()[-1]))
+        return statistics.median(samples)
+
+    def _time_command(self, cmd):
+        probe = f"import subprocess, time\nstart = time.perf_counter()\nsubprocess.run({cmd!r}, check=True, capture_output=True)\nprint(time.perf_counter() - start)\n"
+        return self._probe(probe)
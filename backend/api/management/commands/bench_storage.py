@@ -0,0 +1,64 @@
+import os
+import tempfile
+import time
+
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from api.models import Dataset
+
+
+def _time_read(open_fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with open_fn() as f:
+            pd.read_csv(f)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class Command(BaseCommand):
+    help = "Report disk saved by CSV compression and the read latency it costs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=50, help="number of datasets to sample")
+        parser.add_argument('--repeat', type=int, default=3, help="reads per file, best time is kept")
+
+    def handle(self, *args, **options):
+        raw_total = stored_total = 0
+        plain_time = stored_time = 0.0
+        count = 0
+
+        for dataset in Dataset.objects.order_by('-uploaded_at')[:options['limit']]:
+            storage = dataset.file.storage
+            name = dataset.file.name
+            if not name or not storage.exists(name):
+                continue
+
+            raw_total += storage.raw_size(name)
+            stored_total += storage.size(name)
+
+            # plain copy of the same data as the baseline
+            with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as tmp:
+                storage.export_plain(name, tmp)
+            try:
+                plain_time += _time_read(lambda: open(tmp.name, 'rb'), options['repeat'])
+                stored_time += _time_read(lambda: storage.open(name, 'rb'), options['repeat'])
+            finally:
+                os.remove(tmp.name)
+            count += 1
+
+        if not count:
+            self.stdout.write("no stored datasets to benchmark")
+            return
+
+        saved = raw_total - stored_total
+        ratio = raw_total / stored_total if stored_total else 0.0
+        self.stdout.write(f"datasets:        {count}")
+        self.stdout.write(f"raw size:        {raw_total / 1024:.1f} KiB")
+        self.stdout.write(f"stored size:     {stored_total / 1024:.1f} KiB ({ratio:.1f}x)")
+        self.stdout.write(f"disk saved:      {saved / 1024:.1f} KiB ({100 * saved / raw_total:.1f}%)")
+        self.stdout.write(f"plain read:      {1000 * plain_time / count:.2f} ms/dataset")
+        self.stdout.write(f"stored read:     {1000 * stored_time / count:.2f} ms/dataset "
+                          f"(+{1000 * (stored_time - plain_time) / count:.2f} ms)")
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from api import export
+
+
+class Command(BaseCommand):
+    help = "Render PDF reports for a selection of datasets in parallel into a single zip archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="path of the zip archive to write")
+        parser.add_argument('--start', help="first upload date, YYYY-MM-DD")
+        parser.add_argument('--end', help="last upload date, YYYY-MM-DD")
+        parser.add_argument('--ids', help="comma separated dataset ids")
+        parser.add_argument('--workers', type=int, help="render processes (default: number of cores)")
+        parser.add_argument('--refresh', action='store_true', help="re-render reports even if cached")
+
+    def handle(self, *args, **options):
+        start = parse_date(options['start']) if options['start'] else None
+        end = parse_date(options['end']) if options['end'] else None
+        if (options['start'] and start is None) or (options['end'] and end is None):
+            raise CommandError("--start/--end must be dates like YYYY-MM-DD")
+        ids = [int(i) for i in options['ids'].split(',') if i.strip()] if options['ids'] else None
+
+        datasets = list(export.select_datasets(start, end, ids))
+        if not datasets:
+            raise CommandError("no datasets match the selection")
+
+        started = time.perf_counter()
+        results = export.iter_reports(datasets, workers=options['workers'], refresh=options['refresh'])
+        with open(options['output'], 'wb') as f:
+            for chunk in export.stream_zip(self._log(results)):
+                f.write(chunk)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(datasets)} reports written to {options['output']} in {elapsed:.2f}s "
+            f"({len(datasets) / elapsed:.1f} reports/s)"
+        ))
+
+    def _log(self, results):
+        for dataset, path, error in results:
+            if error:
+                self.stderr.write(f"dataset {dataset.id}: {error}")
+            yield dataset, path, error
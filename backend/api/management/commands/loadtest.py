@@ -0,0 +1,111 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _sample_csv(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    types = rng.choice(['Pump', 'Valve', 'Compressor', 'HeatExchanger', 'Reactor'], rows)
+    lines = ['Equipment Name,Type,Flowrate,Pressure,Temperature']
+    for i in range(rows):
+        lines.append(f"Unit-{i},{types[i]},{rng.normal(120, 20):.1f},{rng.normal(6, 1.5):.2f},{rng.normal(100, 15):.1f}")
+    return ('\n'.join(lines) + '\n').encode()
+
+
+# clients run in their own processes so they aren't serialized on one GIL
+def _upload(url, payload, _):
+    return requests.post(url, files={'file': ('load.csv', payload, 'text/csv')}).status_code == 200
+
+
+def _get(url, _):
+    return requests.get(url).status_code == 200
+
+
+def _run_load(fn, total, concurrency):
+    errors = 0
+    with ProcessPoolExecutor(max_workers=concurrency) as pool:
+        # start every client process before the clock starts
+        list(pool.map(abs, range(concurrency)))
+        start = time.perf_counter()
+        for ok in pool.map(fn, range(total)):
+            errors += not ok
+        elapsed = time.perf_counter() - start
+    return total / elapsed, errors
+
+
+class Command(BaseCommand):
+    help = ("Start gunicorn with each worker count and measure upload and history "
+            "throughput against a throwaway database. Clients share the machine with "
+            "the server, leave them spare cores or the numbers flatten early.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', default='1,2,4', help="comma separated worker counts")
+        parser.add_argument('--requests', type=int, default=200, help="requests per endpoint")
+        parser.add_argument('--concurrency', type=int, default=16, help="concurrent client processes")
+        parser.add_argument('--rows', type=int, default=2000, help="rows in the uploaded csv")
+        parser.add_argument('--port', type=int, default=8765)
+
+    def handle(self, *args, **options):
+        if shutil.which('gunicorn') is None:
+            raise CommandError("gunicorn is not installed")
+
+        worker_counts = [int(w) for w in options['workers'].split(',') if w.strip()]
+        base_url = f"http://127.0.0.1:{options['port']}/api/"
+        payload = _sample_csv(options['rows'])
+        workdir = tempfile.mkdtemp(prefix='loadtest-')
+
+        env = dict(os.environ)
+        env.update({
+            'SQLITE_PATH': os.path.join(workdir, 'db.sqlite3'),
+            'MEDIA_ROOT': os.path.join(workdir, 'media'),
+            'GUNICORN_LOGLEVEL': 'warning',
+        })
+        env.pop('POSTGRES_DB', None)
+
+        try:
+            subprocess.run([sys.executable, 'manage.py', 'migrate', '-v', '0'],
+                           cwd=settings.BASE_DIR, env=env, check=True)
+
+            self.stdout.write(f"{'workers':>8} {'upload req/s':>14} {'history req/s':>14} {'errors':>8}")
+            for count in worker_counts:
+                server = subprocess.Popen(
+                    ['gunicorn', 'backend.wsgi', '-c', 'gunicorn.conf.py',
+                     '--workers', str(count), '--bind', f"127.0.0.1:{options['port']}",
+                     '--access-logfile', '/dev/null'],
+                    cwd=settings.BASE_DIR, env=env,
+                )
+                try:
+                    self._wait_ready(base_url)
+
+                    upload = partial(_upload, base_url + 'upload/', payload)
+                    history = partial(_get, base_url + 'history/')
+                    upload_rate, upload_errors = _run_load(upload, options['requests'], options['concurrency'])
+                    history_rate, history_errors = _run_load(history, options['requests'], options['concurrency'])
+                    self.stdout.write(f"{count:>8} {upload_rate:>14.1f} {history_rate:>14.1f} "
+                                      f"{upload_errors + history_errors:>8}")
+                finally:
+                    server.terminate()
+                    server.wait(timeout=30)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _wait_ready(self, base_url, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if requests.get(base_url + 'history/', timeout=5).status_code == 200:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        raise CommandError("gunicorn did not come up in time")
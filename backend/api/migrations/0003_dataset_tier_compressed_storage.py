@@ -0,0 +1,22 @@
+import api.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_dataset_chart_data'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dataset',
+            name='file',
+            field=models.FileField(storage=api.storage.get_csv_storage, upload_to='csvs/'),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='tier',
+            field=models.CharField(choices=[('hot', 'Hot'), ('cold', 'Cold')], default='hot', max_length=8),
+        ),
+    ]
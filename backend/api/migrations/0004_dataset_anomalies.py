@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_dataset_tier_compressed_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='anomalies',
+            field=models.JSONField(default=dict),
+        ),
+    ]
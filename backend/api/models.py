@@ -1,13 +1,34 @@
 from django.db import models
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .storage import get_csv_storage
 
 class Dataset(models.Model):
+    TIER_HOT = 'hot'
+    TIER_COLD = 'cold'
+    TIER_CHOICES = [(TIER_HOT, 'Hot'), (TIER_COLD, 'Cold')]
+
     uploaded_at = models.DateTimeField(auto_now_add=True)
-    file = models.FileField(upload_to='csvs/')
+    # stored plain, compressed by apply_retention, see api/storage.py
+    file = models.FileField(upload_to='csvs/', storage=get_csv_storage)
+    tier = models.CharField(max_length=8, choices=TIER_CHOICES, default=TIER_HOT)
     # stats from uploaded csv
     total_records = models.IntegerField(default=0)
     avg_pressure = models.FloatField(default=0.0)
     avg_temp = models.FloatField(default=0.0)
     type_distribution = models.JSONField(default=dict)
+    # precomputed histograms / density grids for charts
+    chart_data = models.JSONField(default=dict)
+    # per-type baselines and top anomaly scores, see api/anomaly.py
+    anomalies = models.JSONField(default=dict)
 
     def __str__(self):
-        return f"Dataset {self.id} - {self.uploaded_at.strftime('%H:%M:%S')}"
\ No newline at end of file
+        return f"Dataset {self.id} - {self.uploaded_at.strftime('%H:%M:%S')}"
+
+
+@receiver(post_delete, sender=Dataset)
+def delete_cached_arrays(sender, instance, **kwargs):
+    # imported here, api.arrays pulls in numpy
+    from . import arrays
+    arrays.delete(instance)
@@ -0,0 +1,124 @@
+import io
+
+import matplotlib
+matplotlib.use('Agg')  # needed for server rendering
+import matplotlib.pyplot as plt
+
+# ReportLab Imports for Professional PDF
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+
+from .analysis import widen_floats
+
+
+def build_report_pdf(dataset, df):
+    """Render the PDF report for a dataset, returns a BytesIO positioned at 0."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=40, leftMargin=40, topMargin=40, bottomMargin=40)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # header and title
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=10,
+        textColor=colors.HexColor('#0F766E'),
+        alignment=1
+    )
+    elements.append(Paragraph("Chemical Analysis Report", title_style))
+    elements.append(Paragraph(f"Dataset ID: #{dataset.id} | Generated via Chemical Visualizer", styles['Normal']))
+    elements.append(Spacer(1, 20))
+
+    # summary stats table
+    summary_data = [
+        ['Total Units', 'Avg Pressure (Bar)', 'Avg Temp (°C)'],
+        [dataset.total_records, f"{dataset.avg_pressure:.2f}", f"{dataset.avg_pressure:.2f}"]
+    ]
+
+    summary_table = Table(summary_data, colWidths=[2*inch, 2*inch, 2*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0F766E')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F0FDFA')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#0F766E')),
+        ('FONTSIZE', (0, 1), (-1, -1), 14),
+    ]))
+    elements.append(summary_table)
+    elements.append(Spacer(1, 30))
+
+    # equipment distribution pie chart
+    plt.figure(figsize=(6, 4))
+
+    counts = df['Type'].value_counts()
+    colors_list = ['#0F766E', '#F59E0B', '#3B82F6', '#EF4444', '#8B5CF6']
+
+    plt.pie(counts, labels=counts.index, autopct='%1.1f%%', colors=colors_list[:len(counts)], startangle=140)
+    plt.title('Equipment Type Distribution')
+
+    img_buffer = io.BytesIO()
+    plt.savefig(img_buffer, format='png', bbox_inches='tight', dpi=100)
+    plt.close()
+    img_buffer.seek(0)
+
+    pdf_image = Image(img_buffer, width=400, height=250)
+    elements.append(Paragraph("Equipment Distribution Analysis", styles['Heading2']))
+    elements.append(pdf_image)
+    elements.append(Spacer(1, 20))
+
+    # detailed data table
+    elements.append(Paragraph("Detailed Equipment Data (Top 50 Rows)", styles['Heading2']))
+
+    table_data = [['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temp']]
+
+    subset = widen_floats(df.head(50))
+
+    # table styling
+    table_styles = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ]
+
+    # add data rows and highlight critical values
+    for i, row in subset.iterrows():
+        row_data = [
+            row.get('Equipment Name', '-'),
+            row.get('Type', '-'),
+            row.get('Flowrate', 0),
+            row.get('Pressure', 0),
+            row.get('Temperature', 0)
+        ]
+        table_data.append(row_data)
+
+        # mark critical readings in red
+        try:
+            p = float(row.get('Pressure', 0))
+            t = float(row.get('Temperature', 0))
+            if p > 8.0 or t > 100:
+                table_styles.append(('TEXTCOLOR', (0, i+1), (-1, i+1), colors.red))
+                table_styles.append(('FONTNAME', (0, i+1), (-1, i+1), 'Helvetica-Bold'))
+        except:
+            pass
+
+    data_table = Table(table_data, colWidths=[2.5*inch, 1.2*inch, 1*inch, 1*inch, 1*inch])
+    data_table.setStyle(TableStyle(table_styles))
+
+    elements.append(data_table)
+
+    doc.build(elements)
+    buffer.seek(0)
+
+    return buffer
@@ -1,7 +1,17 @@
+from django.urls import reverse
 from rest_framework import serializers
 from .models import Dataset
 
 class DatasetSerializer(serializers.ModelSerializer):
+    # stored blobs are compressed, link to the view that serves them as csv
+    file = serializers.SerializerMethodField()
+
+    def get_file(self, obj):
+        url = reverse('dataset_csv', args=[obj.id])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
     class Meta:
         model = Dataset
-        fields = '__all__'
\ No newline at end of file
+        # chart data and anomalies are served by their own endpoints
+        exclude = ('chart_data', 'anomalies')
\ No newline at end of file
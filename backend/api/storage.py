@@ -0,0 +1,207 @@
+import gzip
+import io
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+try:
+    import zstandard
+except ImportError:  # optional, gzip works without it
+    zstandard = None
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+CODECS = ('gzip', 'zstd')
+# compressed blobs are named after their codec so raw media links aren't served as csv
+SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+# uploads bigger than this are spooled to disk while compressing
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def _require_codec(codec):
+    if codec not in CODECS:
+        raise ImproperlyConfigured(f"unknown csv compression codec {codec!r}, use one of {CODECS}")
+    if codec == 'zstd' and zstandard is None:
+        raise ImproperlyConfigured("zstd compression needs the 'zstandard' package")
+
+
+def atomic_write(path, write_fn):
+    """Call `write_fn` with a binary file that replaces `path` once it returns.
+
+    Written next to the target then renamed, so concurrent readers never see
+    half a file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write_fn(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def plain_name(name):
+    """Stored name without its codec suffix, i.e. the name that was uploaded."""
+    for suffix in SUFFIXES.values():
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def detect_codec(head):
+    """Codec name from the first bytes of a blob, None when it is plain."""
+    if head.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if head.startswith(ZSTD_MAGIC):
+        return 'zstd'
+    return None
+
+
+def compress_chunks(chunks, dst, codec, level):
+    """Write an iterable of byte chunks to `dst` compressed with `codec`."""
+    _require_codec(codec)
+    if codec == 'zstd':
+        cctx = zstandard.ZstdCompressor(level=level)
+        with cctx.stream_writer(dst, closefd=False) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    else:
+        with gzip.GzipFile(fileobj=dst, mode='wb', compresslevel=level, mtime=0) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+
+
+def open_decompressed(path):
+    """Binary stream over a stored blob, decompressing on the fly if needed."""
+    with open(path, 'rb') as fh:
+        codec = detect_codec(fh.read(4))
+    if codec == 'gzip':
+        return gzip.open(path, 'rb')
+    if codec == 'zstd':
+        _require_codec('zstd')
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'))
+    return open(path, 'rb')
+
+
+def _read_chunks(fh, size=64 * 1024):
+    while True:
+        chunk = fh.read(size)
+        if not chunk:
+            break
+        yield chunk
+
+
+class DecompressedFile(File):
+    # GzipFile reports its mode as an int, readers like pandas expect 'rb'
+    def __init__(self, file, name=None, mode='rb'):
+        super().__init__(file, name)
+        self.mode = mode
+
+
+@deconstructible
+class CompressedFileSystemStorage(FileSystemStorage):
+    """FileSystemStorage that keeps blobs compressed on disk.
+
+    Reads are always decompressed in a stream, so plain files written before
+    compression was enabled stay readable until `apply_retention` gets to them.
+    """
+
+    def __init__(self, codec=None, level=None, compress_on_write=None, **kwargs):
+        super().__init__(**kwargs)
+        self._codec = codec
+        self._level = level
+        self._compress_on_write = compress_on_write
+
+    @property
+    def codec(self):
+        return self._codec or getattr(settings, 'CSV_COMPRESSION', 'gzip')
+
+    @property
+    def level(self):
+        if self._level is not None:
+            return self._level
+        return getattr(settings, 'CSV_COMPRESSION_LEVEL', 6)
+
+    @property
+    def compress_on_write(self):
+        if self._compress_on_write is not None:
+            return self._compress_on_write
+        return getattr(settings, 'CSV_COMPRESS_ON_WRITE', False)
+
+    def _open(self, name, mode='rb'):
+        if 'r' not in mode or '+' in mode:
+            return super()._open(name, mode)
+        fh = open_decompressed(self.path(name))
+        if 'b' not in mode:
+            return DecompressedFile(io.TextIOWrapper(fh, encoding='utf-8'), name, 'r')
+        return DecompressedFile(fh, name)
+
+    def get_available_name(self, name, max_length=None):
+        if self.compress_on_write and plain_name(name) == name:
+            name += SUFFIXES[self.codec]
+        return super().get_available_name(name, max_length)
+
+    def _save(self, name, content):
+        if not self.compress_on_write:
+            return super()._save(name, content)
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        compress_chunks(content.chunks(), spool, self.codec, self.level)
+        spool.seek(0)
+        try:
+            return super()._save(name, File(spool, name))
+        finally:
+            spool.close()
+
+    def stored_codec(self, name):
+        with open(self.path(name), 'rb') as fh:
+            return detect_codec(fh.read(4))
+
+    def raw_size(self, name):
+        """Size of the blob once decompressed."""
+        total = 0
+        with open_decompressed(self.path(name)) as fh:
+            for chunk in _read_chunks(fh):
+                total += len(chunk)
+        return total
+
+    def recompress(self, name, codec=None, level=None, new_name=None):
+        """Rewrite a stored blob with `codec`/`level`, optionally under a new
+        name (used to move datasets between tiers). The name gets the codec's
+        suffix. Returns the final name."""
+        codec = codec or self.codec
+        level = self.level if level is None else level
+        target = plain_name(new_name or name) + SUFFIXES[codec]
+        if target != name:
+            target = self.get_available_name(target)
+
+        def write(dst):
+            with open_decompressed(self.path(name)) as src:
+                compress_chunks(_read_chunks(src), dst, codec, level)
+
+        atomic_write(self.path(target), write)
+
+        if target != name:
+            self.delete(name)
+        return target
+
+    def export_plain(self, name, dst):
+        """Copy the decompressed blob into an open binary file."""
+        with open_decompressed(self.path(name)) as src:
+            shutil.copyfileobj(src, dst)
+
+
+csv_storage = CompressedFileSystemStorage()
+
+
+def get_csv_storage():
+    return csv_storage
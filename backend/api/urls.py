@@ -1,10 +1,14 @@
 from django.urls import path
-from .views import UploadCSVView, HistoryView, DownloadPDFView, login_view, GetDatasetView
+from .views import UploadCSVView, HistoryView, DownloadPDFView, login_view, GetDatasetView, ChartDataView, BatchReportView, AnomaliesView, DatasetCSVView
 
 urlpatterns = [
     path('upload/', UploadCSVView.as_view(), name='upload'),
     path('history/', HistoryView.as_view(), name='history'),
     path('report/<int:dataset_id>/', DownloadPDFView.as_view(), name='report'),
+    path('reports/batch/', BatchReportView.as_view(), name='batch_report'),
     path('login/', login_view, name='login'),
     path('history/<int:id>/', GetDatasetView.as_view(), name='get_dataset'),
+    path('history/<int:id>/csv/', DatasetCSVView.as_view(), name='dataset_csv'),
+    path('charts/<int:dataset_id>/', ChartDataView.as_view(), name='chart_data'),
+    path('anomalies/<int:dataset_id>/', AnomaliesView.as_view(), name='anomalies'),
 ]
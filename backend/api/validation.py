@@ -0,0 +1,179 @@
+import contextlib
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+
+REQUIRED_COLUMNS = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+NUMERIC_COLUMNS = ['Flowrate', 'Pressure', 'Temperature']
+DTYPES = {'Equipment Name': 'object', 'Type': 'category', **{c: 'float32' for c in NUMERIC_COLUMNS}}
+
+# how much of the upload the sniffer looks at before anything is parsed or stored
+SNIFF_BYTES = 64 * 1024
+MAX_REPORTED_ERRORS = 50
+
+
+class CSVValidationError(ValueError):
+    def __init__(self, message, details=None):
+        super().__init__(message)
+        self.details = details or {}
+
+
+def _is_number(value):
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def sniff(file_obj):
+    """Check the header and a sample of rows from the first bytes of the upload.
+
+    Returns the header as written in the file (column names may carry
+    surrounding whitespace). Leaves the file at position 0.
+    """
+    head = file_obj.read(SNIFF_BYTES)
+    file_obj.seek(0)
+
+    if not head.strip():
+        raise CSVValidationError("The file is empty")
+    if b'\x00' in head:
+        raise CSVValidationError("The file is not a text CSV")
+
+    # only look at complete lines, the sample may end mid-row
+    if len(head) == SNIFF_BYTES and b'\n' in head:
+        head = head[:head.rindex(b'\n')]
+    try:
+        text = head.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise CSVValidationError("The file is not UTF-8 encoded")
+
+    rows = list(csv.reader(io.StringIO(text)))
+    header = rows[0] if rows else []
+    names = [c.strip() for c in header]
+
+    missing = [c for c in REQUIRED_COLUMNS if c not in names]
+    if missing:
+        raise CSVValidationError(
+            f"Missing required columns: {', '.join(missing)}",
+            {'missing_columns': missing, 'found_columns': names},
+        )
+
+    sample = [r for r in rows[1:] if r]
+    bad_width = [i + 2 for i, r in enumerate(sample) if len(r) > len(header)]
+    if bad_width:
+        raise CSVValidationError(
+            f"Rows with more fields than the header, starting at line {bad_width[0]}",
+            {'lines': bad_width[:MAX_REPORTED_ERRORS]},
+        )
+
+    # a numeric column with no parseable value at all in the sample is the wrong column
+    for name in NUMERIC_COLUMNS:
+        i = names.index(name)
+        values = [r[i].strip() for r in sample if i < len(r) and r[i].strip()]
+        if values and not any(_is_number(v) for v in values):
+            raise CSVValidationError(
+                f"Column {name} is not numeric",
+                {'column': name, 'sample': values[:5]},
+            )
+
+    return header
+
+
+def _coerce_numeric(df):
+    # vectorized: anything that was present but didn't parse is an error
+    errors = []
+    by_column = {}
+    for name in NUMERIC_COLUMNS:
+        if name not in df.columns:
+            continue
+        raw = df[name]
+        if raw.dtype.kind == 'f':
+            df[name] = raw.astype('float32')
+            continue
+        values = pd.to_numeric(raw, errors='coerce').astype('float32')
+        bad = values.isna().to_numpy() & raw.notna().to_numpy()
+        count = int(bad.sum())
+        if count:
+            by_column[name] = count
+            idx = np.flatnonzero(bad)[:MAX_REPORTED_ERRORS]
+            errors.extend({'row': int(i) + 1, 'column': name, 'value': str(raw.iat[i])} for i in idx)
+        df[name] = values
+    errors.sort(key=lambda e: e['row'])
+    return errors[:MAX_REPORTED_ERRORS], by_column
+
+
+def read_header(file_obj):
+    """Header of a CSV, as written in the file, from its first bytes."""
+    line = file_obj.read(SNIFF_BYTES).split(b'\n', 1)[0]
+    return next(csv.reader([line.decode('utf-8-sig', errors='replace')]), [])
+
+
+@contextlib.contextmanager
+def _rewound(file_obj):
+    # hands the upload to pandas from the start without closing it
+    file_obj.seek(0)
+    try:
+        yield file_obj
+    finally:
+        file_obj.seek(0)
+
+
+def parse(open_file, header):
+    """Parse a CSV into the declared dtypes, reading only the known columns.
+
+    `open_file()` must return the CSV from its start, it is called a second
+    time when some numeric cell doesn't parse. Returns (df, errors, by_column),
+    cells that aren't numbers end up as NaN.
+    """
+    names = {c: c.strip() for c in header}
+    wanted = {c for c, name in names.items() if name in REQUIRED_COLUMNS}
+
+    try:
+        try:
+            # fast path, pandas parses straight into the declared dtypes
+            with open_file() as f:
+                df = pd.read_csv(f, usecols=lambda c: c in wanted,
+                                 dtype={c: DTYPES[names[c]] for c in wanted})
+        except ValueError:
+            # some numeric cell didn't parse, read numerics as text and coerce
+            with open_file() as f:
+                df = pd.read_csv(f, usecols=lambda c: c in wanted,
+                                 dtype={c: 'object' if names[c] in NUMERIC_COLUMNS else DTYPES[names[c]] for c in wanted})
+    except pd.errors.ParserError as e:
+        raise CSVValidationError(f"Malformed CSV: {e}")
+
+    df = df.rename(columns=names)
+    df = df[[c for c in REQUIRED_COLUMNS if c in df.columns]]
+    errors, by_column = _coerce_numeric(df)
+    return df, errors, by_column
+
+
+def load_upload(file_obj):
+    """Sniff, parse and coerce an uploaded CSV.
+
+    Returns (df, report). Raises CSVValidationError before the full parse when
+    the sniffed header or sample is wrong.
+    """
+    header = sniff(file_obj)
+    df, errors, by_column = parse(lambda: _rewound(file_obj), header)
+    if df.empty:
+        raise CSVValidationError("The file has no data rows")
+
+    unusable = [c for c in NUMERIC_COLUMNS if df[c].isna().all()]
+    if unusable:
+        raise CSVValidationError(
+            f"No valid numbers in column(s): {', '.join(unusable)}",
+            {'invalid_values': by_column, 'errors': errors},
+        )
+
+    names = [c.strip() for c in header]
+    report = {
+        'invalid_values': sum(by_column.values()),
+        'by_column': by_column,
+        'errors': errors,
+        'ignored_columns': [c for c in names if c not in REQUIRED_COLUMNS],
+    }
+    return df, report
@@ -1,12 +1,7 @@
-import io
-import pandas as pd
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # needed for server rendering
-import matplotlib.pyplot as plt
-
 from django.shortcuts import get_object_or_404
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_date
 from django.contrib.auth import authenticate
 
 from rest_framework.views import APIView
@@ -17,15 +12,14 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.authtoken.models import Token
 from rest_framework.status import HTTP_400_BAD_REQUEST, HTTP_200_OK
 
-# ReportLab Imports for Professional PDF
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-
 from .models import Dataset
+from .storage import plain_name
 from .serializers import DatasetSerializer
+from . import export
+
+# pandas, numpy, matplotlib and reportlab live in api.analysis, api.charts and
+# api.reports and are imported inside the views that need them, so manage.py
+# commands, login and history don't pay for them (see api/warmup.py)
 
 class UploadCSVView(APIView):
     parser_classes = (MultiPartParser, FormParser)
@@ -37,43 +31,26 @@ class UploadCSVView(APIView):
         file_obj = request.FILES['file']
         
         try:
-            df = pd.read_csv(file_obj)
-            
-            # convert numpy types to python types for django
-            total_records = int(len(df))
-            
-            avg_pressure = 0.0
-            if 'Pressure' in df.columns:
-                avg_pressure = float(df['Pressure'].mean())
-                if np.isnan(avg_pressure): avg_pressure = 0.0
-                
-            avg_temp = 0.0
-            if 'Temperature' in df.columns:
-                avg_temp = float(df['Temperature'].mean())
-                if np.isnan(avg_temp): avg_temp = 0.0
-
-            type_dist = {}
-            if 'Type' in df.columns:
-                vc = df['Type'].value_counts()
-                for k, v in vc.items():
-                    type_dist[str(k)] = int(v)
-
-            stats = {
-                'total_records': total_records,
-                'avg_pressure': round(avg_pressure, 2),
-                'avg_temp': round(avg_temp, 2),
-                'type_distribution': type_dist
-            }
-
-            dataset = Dataset.objects.create(file=file_obj, **stats)
-            
-            df['is_critical'] = (df['Pressure'] > 8.0) | (df['Temperature'] > 100)
-            # clean up nan values before sending to frontend
-            df_clean = df.head(50).where(pd.notnull(df), None)
+            from . import analysis, anomaly, charts, validation
+
+            # rejects bad files before anything is parsed in full or stored
+            try:
+                df, report = validation.load_upload(file_obj)
+            except validation.CSVValidationError as e:
+                return Response({"error": str(e), "details": e.details}, status=400)
+
+            stats = analysis.compute_stats(df)
+            chart_data = charts.build_chart_data(df)
+            anomalies, _ = anomaly.summarize(df)
+
+            dataset = Dataset.objects.create(file=file_obj, chart_data=chart_data, anomalies=anomalies, **stats)
+            charts.load_series(dataset, df)
             
             return Response({
                 "stats": stats,
-                "data": df_clean.to_dict(orient='records'),
+                "data": analysis.preview_rows(df, flag_critical=True),
+                "validation": report,
+                "anomalies": anomalies['top'][:10],
                 "history_id": dataset.id
             })
 
@@ -87,7 +64,7 @@ class HistoryView(APIView):
     def get(self, request):
         try:
             datasets = Dataset.objects.order_by('-uploaded_at')[:5]
-            serializer = DatasetSerializer(datasets, many=True)
+            serializer = DatasetSerializer(datasets, many=True, context={'request': request})
             return Response(serializer.data)
         except Exception as e:
             print(f"error fetching history: {e}")
@@ -99,9 +76,8 @@ class GetDatasetView(APIView):
         
         # read csv file to get actual table data
         try:
-            df = pd.read_csv(dataset.file.path)
-            df_clean = df.head(50).where(pd.notnull(df), None)
-            rows = df_clean.to_dict(orient='records')
+            from . import analysis
+            rows = analysis.preview_rows(analysis.read_dataset_csv(dataset))
         except Exception:
             rows = []
 
@@ -118,118 +94,146 @@ class GetDatasetView(APIView):
         }
         return Response(response_data)
         
-class DownloadPDFView(APIView):
+class DatasetCSVView(APIView):
+    def get(self, request, id):
+        dataset = get_object_or_404(Dataset, pk=id)
+
+        def chunks():
+            # decompressed in a stream by the storage
+            with dataset.file.storage.open(dataset.file.name, 'rb') as f:
+                yield from f.chunks()
+
+        response = StreamingHttpResponse(chunks(), content_type='text/csv')
+        filename = plain_name(dataset.file.name).rsplit('/', 1)[-1]
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+class ChartDataView(APIView):
     def get(self, request, dataset_id):
+        from . import analysis, charts
+
         dataset = get_object_or_404(Dataset, pk=dataset_id)
-        file_path = dataset.file.path
-        df = pd.read_csv(file_path)
-        
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=40, leftMargin=40, topMargin=40, bottomMargin=40)
-        elements = []
-        styles = getSampleStyleSheet()
-
-        # header and title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=10,
-            textColor=colors.HexColor('#0F766E'),
-            alignment=1
-        )
-        elements.append(Paragraph("Chemical Analysis Report", title_style))
-        elements.append(Paragraph(f"Dataset ID: #{dataset.id} | Generated via Chemical Visualizer", styles['Normal']))
-        elements.append(Spacer(1, 20))
-
-        # summary stats table
-        summary_data = [
-            ['Total Units', 'Avg Pressure (Bar)', 'Avg Temp (°C)'],
-            [dataset.total_records, f"{dataset.avg_pressure:.2f}", f"{dataset.avg_pressure:.2f}"]
-        ]
-        
-        summary_table = Table(summary_data, colWidths=[2*inch, 2*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0F766E')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F0FDFA')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#0F766E')),
-            ('FONTSIZE', (0, 1), (-1, -1), 14),
-        ]))
-        elements.append(summary_table)
-        elements.append(Spacer(1, 30))
-
-        # equipment distribution pie chart
-        plt.figure(figsize=(6, 4))
-        
-        counts = df['Type'].value_counts()
-        colors_list = ['#0F766E', '#F59E0B', '#3B82F6', '#EF4444', '#8B5CF6']
-        
-        plt.pie(counts, labels=counts.index, autopct='%1.1f%%', colors=colors_list[:len(counts)], startangle=140)
-        plt.title('Equipment Type Distribution')
-        
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', bbox_inches='tight', dpi=100)
-        plt.close()
-        img_buffer.seek(0)
-        
-        pdf_image = Image(img_buffer, width=400, height=250)
-        elements.append(Paragraph("Equipment Distribution Analysis", styles['Heading2']))
-        elements.append(pdf_image)
-        elements.append(Spacer(1, 20))
 
-        # detailed data table
-        elements.append(Paragraph("Detailed Equipment Data (Top 50 Rows)", styles['Heading2']))
-        
-        table_data = [['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temp']]
-        
-        subset = df.head(50)
-        
-        # table styling
-        table_styles = [
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ]
-
-        # add data rows and highlight critical values
-        for i, row in subset.iterrows():
-            row_data = [
-                row.get('Equipment Name', '-'),
-                row.get('Type', '-'),
-                row.get('Flowrate', 0),
-                row.get('Pressure', 0),
-                row.get('Temperature', 0)
-            ]
-            table_data.append(row_data)
-            
-            # mark critical readings in red
+        series = request.query_params.get('series')
+        method = request.query_params.get('method', 'lttb')
+        try:
+            points = int(request.query_params.get('points', 500))
+        except ValueError:
+            return Response({"error": "points must be an integer"}, status=400)
+
+        if series and series not in charts.NUMERIC_COLUMNS:
+            return Response({"error": f"series must be one of {charts.NUMERIC_COLUMNS}"}, status=400)
+        if method not in charts.DOWNSAMPLE_METHODS:
+            return Response({"error": f"method must be one of {list(charts.DOWNSAMPLE_METHODS)}"}, status=400)
+        if not 3 <= points <= charts.MAX_POINTS:
+            return Response({"error": f"points must be between 3 and {charts.MAX_POINTS}"}, status=400)
+
+        # raw rows are only needed to backfill older datasets, series come
+        # from the base stored at upload
+        df = None
+        try:
+            if not dataset.chart_data:
+                df = analysis.read_dataset_csv(dataset)
+                dataset.chart_data = charts.build_chart_data(df)
+                dataset.save(update_fields=['chart_data'])
+            base = charts.load_series(dataset, df) if series else None
+        except Exception as e:
+            return Response({"error": f"could not read dataset: {e}"}, status=500)
+
+        response_data = dict(dataset.chart_data)
+        if series:
+            if f'{series}_y' not in base:
+                return Response({"error": f"column {series} not in dataset"}, status=400)
+            response_data['series'] = charts.downsample(base, series, points, method)
+
+        response_data['history_id'] = dataset.id
+        return Response(response_data)
+
+class AnomaliesView(APIView):
+    def get(self, request, dataset_id):
+        dataset = get_object_or_404(Dataset, pk=dataset_id)
+
+        equipment_type = request.query_params.get('type')
+        try:
+            k = int(request.query_params.get('k', 10))
+        except ValueError:
+            return Response({"error": "k must be an integer"}, status=400)
+        from . import analysis, anomaly
+        if not 1 <= k <= anomaly.MAX_K:
+            return Response({"error": f"k must be between 1 and {anomaly.MAX_K}"}, status=400)
+
+        # backfill datasets uploaded before scoring existed
+        if not dataset.anomalies:
             try:
-                p = float(row.get('Pressure', 0))
-                t = float(row.get('Temperature', 0))
-                if p > 8.0 or t > 100:
-                    table_styles.append(('TEXTCOLOR', (0, i+1), (-1, i+1), colors.red))
-                    table_styles.append(('FONTNAME', (0, i+1), (-1, i+1), 'Helvetica-Bold'))
-            except:
-                pass
-
-        data_table = Table(table_data, colWidths=[2.5*inch, 1.2*inch, 1*inch, 1*inch, 1*inch])
-        data_table.setStyle(TableStyle(table_styles))
-        
-        elements.append(data_table)
+                df = analysis.read_dataset_csv(dataset)
+            except Exception as e:
+                return Response({"error": f"could not read dataset: {e}"}, status=500)
+            dataset.anomalies, _ = anomaly.summarize(df)
+            dataset.save(update_fields=['anomalies'])
+
+        summary = dataset.anomalies
+        if equipment_type:
+            if equipment_type not in summary['by_type']:
+                return Response({"error": f"No equipment of type {equipment_type}"}, status=404)
+            top = summary['by_type'][equipment_type]['top']
+            available = summary['by_type'][equipment_type]['count']
+        else:
+            top = summary['top']
+            available = sum(info['count'] for info in summary['by_type'].values())
+
+        # the stored summary only keeps the top rows, go to the full ranking past them
+        if len(top) < min(k, available):
+            try:
+                top = anomaly.top_records(dataset, k, equipment_type)
+            except Exception as e:
+                return Response({"error": f"could not read dataset: {e}"}, status=500)
+
+        return Response({
+            "history_id": dataset.id,
+            "features": summary['features'],
+            "threshold": summary['threshold'],
+            "outliers": summary['outliers'],
+            "by_type": {t: {key: v for key, v in info.items() if key != 'top'} for t, info in summary['by_type'].items()},
+            "available": available,
+            "anomalies": top[:k],
+        })
 
-        doc.build(elements)
-        buffer.seek(0)
-        
-        return HttpResponse(buffer, content_type='application/pdf')
+class DownloadPDFView(APIView):
+    def get(self, request, dataset_id):
+        dataset = get_object_or_404(Dataset, pk=dataset_id)
+
+        # reuses the cached pdf when there is one
+        path = export.render_report(dataset.id)
+        return FileResponse(open(path, 'rb'), content_type='application/pdf')
+
+class BatchReportView(APIView):
+    def get(self, request):
+        params = request.query_params
+        try:
+            start = parse_date(params['start']) if params.get('start') else None
+            end = parse_date(params['end']) if params.get('end') else None
+            ids = [int(i) for i in params['ids'].split(',') if i.strip()] if params.get('ids') else None
+            # parse_date returns None for anything that isn't YYYY-MM-DD
+            if (params.get('start') and start is None) or (params.get('end') and end is None):
+                raise ValueError
+        except ValueError:
+            return Response({"error": "start/end must be YYYY-MM-DD dates and ids a comma separated list"}, status=400)
+
+        datasets = list(export.select_datasets(start, end, ids))
+        if not datasets:
+            return Response({"error": "No datasets match the selection"}, status=404)
+        if len(datasets) > settings.BATCH_EXPORT_MAX_DATASETS:
+            return Response({
+                "error": f"{len(datasets)} datasets selected, at most {settings.BATCH_EXPORT_MAX_DATASETS} per request. "
+                         "Narrow the selection or run manage.py export_reports."
+            }, status=400)
+
+        response = StreamingHttpResponse(
+            export.stream_zip(export.iter_reports(datasets, workers=settings.BATCH_EXPORT_WORKERS)),
+            content_type='application/zip',
+        )
+        response['Content-Disposition'] = 'attachment; filename="reports.zip"'
+        return response
     
 @api_view(['POST'])
 @permission_classes([AllowAny])
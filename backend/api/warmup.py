@@ -0,0 +1,10 @@
+import importlib
+
+# modules views import lazily, in rough order of cost
+HEAVY_MODULES = ['api.analysis', 'api.validation', 'api.anomaly', 'api.charts', 'api.arrays', 'api.reports']
+
+
+def prewarm(modules=HEAVY_MODULES):
+    """Import the lazily loaded service modules ahead of the first request."""
+    for name in modules:
+        importlib.import_module(name)
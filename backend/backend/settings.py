@@ -62,12 +62,41 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# persistent connections, reused across requests by each worker
+CONN_MAX_AGE = int(os.environ.get('CONN_MAX_AGE', 60))
+
+if os.environ.get('POSTGRES_DB'):
+    # optional postgres path (needs psycopg), used when POSTGRES_DB is set
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ['POSTGRES_DB'],
+            'USER': os.environ.get('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+else:
+    # WAL lets readers run alongside a writer, IMMEDIATE transactions plus a busy
+    # timeout make concurrent writers wait instead of failing with "database is locked"
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'OPTIONS': {
+                'timeout': 20,
+                'transaction_mode': 'IMMEDIATE',
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                ),
+            },
+        }
     }
-}
 
 
 #password validation
@@ -123,4 +152,29 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 CORS_ALLOW_ALL_ORIGINS = True
 
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
\ No newline at end of file
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))
+
+# rendered pdf reports, reused by the report and batch export endpoints
+REPORT_CACHE_DIR = os.environ.get('REPORT_CACHE_DIR', os.path.join(MEDIA_ROOT, 'reports'))
+
+# /api/reports/batch/ renders inside the web worker: larger selections are
+# refused (use manage.py export_reports), and more than one process per request
+# competes with the other gunicorn workers for the same cores
+BATCH_EXPORT_MAX_DATASETS = int(os.environ.get('BATCH_EXPORT_MAX_DATASETS', 50))
+BATCH_EXPORT_WORKERS = int(os.environ.get('BATCH_EXPORT_WORKERS', 1))
+
+# arrays derived from each upload (downsampling base for chart series, per-row
+# anomaly scores), rebuilt when missing. apply_retention clears them for cold datasets
+DATASET_CACHE_DIR = os.environ.get('DATASET_CACHE_DIR', os.path.join(MEDIA_ROOT, 'cache'))
+
+# csv storage, see api/storage.py. Uploads are stored plain so the upload request
+# doesn't pay for compression, apply_retention compresses them once they are
+# CSV_COMPRESS_AFTER_DAYS old
+CSV_COMPRESSION = os.environ.get('CSV_COMPRESSION', 'gzip')  # 'gzip' or 'zstd' (needs zstandard)
+CSV_COMPRESSION_LEVEL = int(os.environ.get('CSV_COMPRESSION_LEVEL', 6))
+CSV_COMPRESS_ON_WRITE = os.environ.get('CSV_COMPRESS_ON_WRITE', '0') == '1'
+
+# retention (manage.py apply_retention)
+CSV_COMPRESS_AFTER_DAYS = int(os.environ.get('CSV_COMPRESS_AFTER_DAYS', 1))
+CSV_COLD_AFTER_DAYS = int(os.environ.get('CSV_COLD_AFTER_DAYS', 90))
+CSV_COLD_COMPRESSION_LEVEL = int(os.environ.get('CSV_COLD_COMPRESSION_LEVEL', 9))
@@ -0,0 +1,36 @@
+# production serving profile: gunicorn -c gunicorn.conf.py backend.wsgi
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+
+# request handling is mostly CPU bound (pandas, pdf rendering), one worker per core
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# pdf reports on big datasets can take a while, and /api/reports/batch/ renders
+# up to BATCH_EXPORT_MAX_DATASETS uncached reports in one request. A sync worker
+# is killed once a request runs past this, export bigger batches with
+# manage.py export_reports
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 300))
+graceful_timeout = 30
+keepalive = 5
+
+# recycle workers now and then to keep matplotlib/pandas memory in check
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = 100
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
+
+# views import pandas/matplotlib/reportlab lazily, set PREWARM_IMPORTS=1 to load
+# them in each worker before it starts serving instead of on its first request
+prewarm_imports = os.environ.get('PREWARM_IMPORTS', '0') == '1'
+
+
+def post_worker_init(worker):
+    if prewarm_imports:
+        from api.warmup import prewarm
+        prewarm()
@@ -7,11 +7,12 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QWidget,
                              QTableWidgetItem, QHeaderView, QAbstractItemView)
 from PyQt5.QtGui import QColor, QFont, QIcon, QPixmap
 from PyQt5.QtCore import Qt, QSize
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
+# matplotlib is imported in init_ui, after login, so the login dialog shows up fast
 
 # api endpoint
 API_URL = "http://127.0.0.1:8000/api/"
+# the server downsamples the series, big uploads stay cheap to draw
+SERIES_POINTS = 1000
 
 # app styling
 STYLESHEET = """
@@ -197,7 +198,10 @@ class ChemicalVisualizerDesktop(QMainWindow):
         chart_header.addStretch()
         chart_layout.addLayout(chart_header)
         
-        self.figure = plt.figure(facecolor='#FFFFFF')
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
+        self.figure = Figure(facecolor='#FFFFFF')
         self.canvas = FigureCanvas(self.figure)
         chart_layout.addWidget(self.canvas)
         
@@ -295,6 +299,23 @@ class ChemicalVisualizerDesktop(QMainWindow):
         else:
             QMessageBox.warning(self, "No Data", "Please upload a CSV file first.")
 
+    def fetch_chart_data(self):
+        # charts are extra, without them the dashboard still shows the bar chart
+        try:
+            headers = {'Authorization': f'Token {self.token}'} if self.token else {}
+            params = {'series': 'Pressure', 'points': SERIES_POINTS, 'method': 'minmax'}
+            response = requests.get(f"{API_URL}charts/{self.current_id}/", params=params, headers=headers)
+            if response.status_code == 200:
+                return response.json()
+        except requests.RequestException:
+            pass
+        return None
+
+    def style_axes(self, ax, title):
+        ax.set_title(title, fontsize=12, color='#334155')
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+
     def update_dashboard(self, full_data):
         stats = full_data['stats']
         rows = full_data['data']
@@ -304,16 +325,37 @@ class ChemicalVisualizerDesktop(QMainWindow):
         self.stats_labels["Avg Temp"].setText(f"{stats['avg_temp']} °C")
         self.stats_labels["Total Units"].setText(str(stats['total_records']))
 
-        # redraw bar chart
+        # redraw charts, the pressure histogram and series come precomputed
+        # from the server so they don't depend on the 50 preview rows
         self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        chart_data = self.fetch_chart_data()
+        n_plots = 3 if chart_data else 1
+
+        ax = self.figure.add_subplot(n_plots, 1, 1)
         types = list(stats['type_distribution'].keys())
         counts = list(stats['type_distribution'].values())
         colors = ['#0F766E', '#F59E0B', '#3B82F6', '#EF4444']
         ax.bar(types, counts, color=colors[:len(types)])
-        ax.set_title("Equipment Distribution", fontsize=12, color='#334155')
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
+        self.style_axes(ax, "Equipment Distribution")
+
+        if chart_data:
+            hist = chart_data['histograms']['all'].get('Pressure', {})
+            edges = hist.get('edges', [])
+            ax = self.figure.add_subplot(n_plots, 1, 2)
+            if edges:
+                widths = [b - a for a, b in zip(edges, edges[1:])]
+                ax.bar(edges[:-1], hist['counts'], width=widths, align='edge', color='#3B82F6')
+            self.style_axes(ax, "Pressure Histogram")
+
+            series = chart_data.get('series')
+            ax = self.figure.add_subplot(n_plots, 1, 3)
+            if series:
+                ax.plot(series['x'], series['y'], color='#0F766E', linewidth=0.8)
+                self.style_axes(ax, f"Pressure by Row ({len(series['x'])} of {series['total_points']} points)")
+            else:
+                self.style_axes(ax, "Pressure by Row")
+
+        self.figure.tight_layout()
         self.canvas.draw()
 
         # populate table and highlight critical rows